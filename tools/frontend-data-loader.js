@@ -1,10 +1,14 @@
 /*
  * Front-end data loading helper for the static dashboard.
  *
+ * Every slice is column-oriented: ``{ columns, data }`` where ``data`` maps a
+ * column name to the array of its values, so ``data[column][row]`` is a cell.
+ *
  * The generated ``data/index.json`` file contains:
  *   - a ``filters`` object with all possible values for each filter dropdown.
- *   - a ``partitions`` array where every entry describes a JSON (or csv.gz)
- *     slice that only contains the records matching those filter values.
+ *   - a ``partitions`` array where every entry describes a JSON (csv.gz or
+ *     parquet) slice that only contains the records matching those filter
+ *     values.  Parquet partitions also carry per-column ``stats`` (min/max).
  *
  * The code below loads the metadata, downloads the minimum number of
  * partitions required for the current filter selection, and exposes helper
@@ -48,16 +52,36 @@ async function fetchMetadata() {
 }
 
 /**
- * Fetch and parse a partition.  JSON is decoded via ``response.json()``,
+ * Read a JSON response body, inflating it first when the generator wrote a
+ * gzip file.  GitHub Pages serves ``.gz`` files as opaque binaries (no
+ * ``Content-Encoding`` header), so the browser will not decompress them.
+ */
+async function readJson(response, encoding) {
+  if (encoding !== 'gzip') return response.json();
+  const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+  return new Response(stream).json();
+}
+
+/**
+ * Fetch and parse a partition.  JSON is decoded via ``readJson``,
  * while compressed CSV is parsed client-side with ``Papaparse`` or a
  * lightweight streaming CSV reader (plug the parser you already use).
+ * Parquet slices are handed to ``readParquet`` (for example a thin wrapper
+ * around ``hyparquet`` or ``parquet-wasm``) which must resolve to the same
+ * column-oriented ``{ columns, data }`` shape.
  */
-async function loadPartitionSlice(partition, format) {
+async function loadPartitionSlice(partition, { format, encoding }, readParquet) {
   const url = `${DATA_ROOT}/${partition.path}`;
+  if (format === 'parquet') {
+    if (!readParquet) throw new Error('A Parquet reader is required to load parquet partitions');
+    const response = await fetch(url, { cache: 'force-cache' });
+    if (!response.ok) throw new Error(`Failed to download ${url}`);
+    return readParquet(await response.arrayBuffer());
+  }
   if (format === 'json') {
     const response = await fetch(url, { cache: 'force-cache' });
     if (!response.ok) throw new Error(`Failed to download ${url}`);
-    const { columns, data } = await response.json();
+    const { columns, data } = await readJson(response, encoding);
     return { columns, data };
   }
   // Example CSV loader – replace with the parser you prefer.
@@ -66,35 +90,71 @@ async function loadPartitionSlice(partition, format) {
   const text = await response.text();
   const [header, ...rows] = text.trim().split('\n');
   const columns = header.split(',');
-  const data = rows.map((line) => line.split(','));
+  const data = Object.fromEntries(columns.map((column) => [column, []]));
+  for (const line of rows) {
+    line.split(',').forEach((cell, idx) => data[columns[idx]]?.push(cell));
+  }
   return { columns, data };
 }
 
 /**
- * Convert a row-oriented array into a column index map for cheap filtering.
+ * Use the partition min/max statistics to rule out slices that cannot contain
+ * rows for the active filters.  Partitions without stats are always kept.
+ */
+function partitionMayMatch(partition, filters) {
+  if (!partition.stats) return true;
+  return Object.entries(filters).every(([column, value]) => {
+    const range = partition.stats[column];
+    if (!range || value == null || value === '') return true;
+    const candidates = Array.isArray(value) ? value : [value];
+    if (!candidates.length) return true;
+    // Only prune on values of the same type as the statistics; anything else
+    // (e.g. mixed columns stored as text) has to be downloaded to be checked.
+    return candidates.some(
+      (candidate) =>
+        typeof candidate !== typeof range.min ||
+        (candidate >= range.min && candidate <= range.max)
+    );
+  });
+}
+
+/**
+ * Number of rows in a column-oriented slice.
+ */
+function sliceLength(slice) {
+  return slice.columns.length ? slice.data[slice.columns[0]].length : 0;
+}
+
+/**
+ * Compare a cell with a filter value.  Filter values are typed like the JSON
+ * cells, while CSV slices only hold text, so numbers and booleans are also
+ * matched against their textual form.
  */
-function createColumnIndex(columns) {
-  const index = new Map();
-  columns.forEach((name, idx) => index.set(name, idx));
-  return index;
+function cellMatches(cell, value) {
+  if (cell === value) return true;
+  if (typeof cell !== 'string' || cell === '') return false;
+  if (typeof value === 'number') return Number(cell) === value;
+  if (typeof value === 'boolean') return cell.toLowerCase() === String(value);
+  return false;
 }
 
 /**
  * Filter the combined dataset by the active filter state without mutating the
- * original data arrays.
+ * original data arrays.  Returns the indices of the matching rows.
  */
-function filterRows(columnIndex, rows, filters) {
-  const entries = Object.entries(filters).filter(([, value]) => value != null && value !== '');
+function filterRows(slice, filters) {
+  const rows = Array.from({ length: sliceLength(slice) }, (_, idx) => idx);
+  const entries = Object.entries(filters).filter(
+    ([column, value]) => value != null && value !== '' && slice.data[column]
+  );
   if (!entries.length) return rows;
   return rows.filter((row) =>
     entries.every(([column, value]) => {
-      const idx = columnIndex.get(column);
-      if (idx == null) return true;
-      const cell = row[idx];
+      const cell = slice.data[column][row];
       if (Array.isArray(value)) {
-        return value.length === 0 || value.includes(cell);
+        return value.length === 0 || value.some((candidate) => cellMatches(cell, candidate));
       }
-      return value === '' || cell === value;
+      return cellMatches(cell, value);
     })
   );
 }
@@ -102,10 +162,12 @@ function filterRows(columnIndex, rows, filters) {
 /**
  * Group rows by one or more dimensions, aggregating metrics for the pivots.
  */
-function buildPivot(rows, columnIndex, groupBy, metrics) {
+function buildPivot(slice, rows, groupBy, metrics) {
   const table = new Map();
+  const groupColumns = groupBy.map((column) => slice.data[column] ?? []);
+  const metricColumns = metrics.map((metric) => slice.data[metric.source] ?? []);
   for (const row of rows) {
-    const groupKey = groupBy.map((column) => row[columnIndex.get(column)] ?? '∅').join('¦');
+    const groupKey = groupColumns.map((values) => values[row] ?? '∅').join('¦');
     let bucket = table.get(groupKey);
     if (!bucket) {
       bucket = { key: groupKey, values: {}, rows: [] };
@@ -113,12 +175,12 @@ function buildPivot(rows, columnIndex, groupBy, metrics) {
       table.set(groupKey, bucket);
     }
     bucket.rows.push(row);
-    for (const metric of metrics) {
-      const value = Number(row[columnIndex.get(metric.source)] || 0);
+    metrics.forEach((metric, idx) => {
+      const value = Number(metricColumns[idx][row] || 0);
       bucket.values[metric.name] += metric.reducer === 'avg'
         ? value / rows.length
         : value;
-    }
+    });
   }
   return Array.from(table.values());
 }
@@ -127,7 +189,7 @@ function buildPivot(rows, columnIndex, groupBy, metrics) {
  * The central store keeps metadata, caches partition downloads, exposes a
  * filter API, and broadcasts changes so the pivot widgets stay in sync.
  */
-export async function createDataStore(initialFilters = {}) {
+export async function createDataStore(initialFilters = {}, { readParquet } = {}) {
   const emitter = createEmitter();
   const { metadata, partitionsByFilter } = await fetchMetadata();
   const cache = new Map();
@@ -138,14 +200,16 @@ export async function createDataStore(initialFilters = {}) {
     if (!cache.has(key)) {
       const partition = partitionsByFilter.get(key);
       if (!partition) {
-        // Fallback: load every partition and merge client-side.
+        // Fallback: load every partition that may match and merge client-side.
         const downloads = await Promise.all(
-          metadata.partitions.map((p) => loadPartitionSlice(p, metadata.format))
+          metadata.partitions
+            .filter((p) => partitionMayMatch(p, filters))
+            .map((p) => loadPartitionSlice(p, metadata, readParquet))
         );
         const combined = mergeSlices(downloads);
         cache.set(key, combined);
       } else {
-        const slice = await loadPartitionSlice(partition, metadata.format);
+        const slice = await loadPartitionSlice(partition, metadata, readParquet);
         cache.set(key, slice);
       }
     }
@@ -153,16 +217,20 @@ export async function createDataStore(initialFilters = {}) {
   }
 
   function mergeSlices(slices) {
-    if (!slices.length) return { columns: [], data: [] };
+    if (!slices.length) return { columns: [], data: {} };
     const columns = slices[0].columns;
-    const data = slices.flatMap((slice) => slice.data);
+    const data = {};
+    for (const column of columns) {
+      data[column] = [].concat(
+        ...slices.map((slice) => slice.data[column] ?? Array(sliceLength(slice)).fill(null))
+      );
+    }
     return { columns, data };
   }
 
   async function getRows(filters = activeFilters) {
     const slice = await ensurePartitions(filters);
-    const columnIndex = createColumnIndex(slice.columns);
-    return { columnIndex, rows: filterRows(columnIndex, slice.data, filters) };
+    return { columns: slice.columns, data: slice.data, rows: filterRows(slice, filters) };
   }
 
   async function updateFilters(patch) {
@@ -180,8 +248,8 @@ export async function createDataStore(initialFilters = {}) {
       return getRows(activeFilters);
     },
     async query(groupBy, metrics) {
-      const { columnIndex, rows } = await getRows(activeFilters);
-      return buildPivot(rows, columnIndex, groupBy, metrics);
+      const slice = await getRows(activeFilters);
+      return buildPivot(slice, slice.rows, groupBy, metrics);
     },
     async setFilters(nextFilters) {
       return updateFilters(nextFilters);
@@ -193,7 +261,8 @@ export async function createDataStore(initialFilters = {}) {
 // Example usage -------------------------------------------------------------
 
 // const dataStore = await createDataStore({ date: '2024-01-01' });
-// const { rows, columnIndex } = await dataStore.bootstrap();
+// const { data, rows } = await dataStore.bootstrap();
+// const firstStore = data.store[rows[0]];
 // const overviewPivot = await dataStore.query(
 //   ['store', 'targetingType'],
 //   [
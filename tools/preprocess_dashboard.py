@@ -12,24 +12,66 @@ Usage example::
           --filters date store category targetingType asin \
           --partition date:month store
 
-This writes ``data/index.json`` with metadata plus one JSON file per partition.
+This writes ``data/index.json`` with metadata plus one gzip-compressed JSON file
+per partition.
+Pass ``--format parquet`` (requires ``pyarrow``) to write zstd-compressed
+Parquet slices instead; their per-column min/max statistics are copied into
+``index.json`` so the frontend can skip partitions that cannot match a filter.
 """
 
 from __future__ import annotations
 
 import argparse
 import datetime as dt
+import gzip
 import hashlib
 import json
 import math
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Mapping, MutableMapping, Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Sequence
 
 import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+try:
+    import python_calamine  # noqa: F401  (only needed for the pandas engine)
+except ImportError:  # pragma: no cover - optional dependency
+    EXCEL_ENGINE = "openpyxl"
+else:
+    EXCEL_ENGINE = "calamine"
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
 
 ISO_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%m/%d/%Y")
+PERIOD_UNITS = {"month": "M", "year": "Y"}
+SLUG_TABLE = str.maketrans(
+    {chr(code): chr(code).lower() if chr(code).isalnum() else "-" for code in range(128)}
+)
+
+
+def positive_int(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
 
 
 def parse_args() -> argparse.Namespace:
@@ -62,7 +104,7 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--format",
-        choices=("json", "csv.gz"),
+        choices=("json", "csv.gz", "parquet"),
         default="json",
         help="Format for partition slices (default: json)",
     )
@@ -72,6 +114,12 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional indentation level for JSON output.",
     )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=os.cpu_count(),
+        help="Number of processes writing partition slices (default: CPU count, 1 disables).",
+    )
     return parser.parse_args()
 
 
@@ -79,40 +127,95 @@ def ensure_output_directory(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+def unique_column_names(names: Iterable[object]) -> List[str]:
+    """Strip header names and suffix repeats (``Store``, ``Store.1``) the way pandas does."""
+    seen: set[str] = set()
+    unique: List[str] = []
+    for name in names:
+        base = candidate = str(name).strip()
+        suffix = 0
+        while candidate in seen:
+            suffix += 1
+            candidate = f"{base}.{suffix}"
+        seen.add(candidate)
+        unique.append(candidate)
+    return unique
+
+
 def read_workbook(path: Path, sheet: str | None) -> pd.DataFrame:
-    df = pd.read_excel(path, sheet_name=sheet, engine="openpyxl")
-    df = df.dropna(axis=0, how="all")
-    df = df.rename(columns=lambda c: str(c).strip())
-    df = df.replace({"": pd.NA})
+    # calamine parses the XLSX stream in native code; openpyxl is the pure
+    # Python fallback when ``python-calamine`` is not installed.
+    df = pd.read_excel(path, sheet_name=sheet if sheet is not None else 0, engine=EXCEL_ENGINE)
+    # The reader stops at the last used row, so fully blank rows are rare;
+    # only copy the frame when some are actually present.  Resetting the index
+    # keeps positions and labels aligned for the positional ``take`` used for
+    # partition slices.
+    blank_rows = df.isna().all(axis=1)
+    if blank_rows.any():
+        df = df.loc[~blank_rows].reset_index(drop=True)
+    df.columns = unique_column_names(df.columns)
+    # Empty strings can only appear in text columns; numeric blocks are skipped.
+    for column in df.select_dtypes(include=["object", "string"]).columns:
+        values = df[column]
+        blank = values == ""
+        if blank.any():
+            df[column] = values.mask(blank)
+    if pa is not None:
+        # Arrow-backed text keeps strings in contiguous buffers instead of one
+        # Python object per cell, which also makes hashing/factorize cheaper.
+        # Dates and numbers stay on numpy, where the date and period paths are
+        # vectorised; Arrow would route them through per-element iteration.
+        for column in df.columns:
+            values = df[column]
+            if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) == "string":
+                df[column] = values.astype("string[pyarrow]")
     return df
 
 
+def guess_date_format(values: pd.Series) -> str:
+    """Pick one format from the first non-null text value so the column is parsed once."""
+    sample = values.dropna()
+    if sample.empty or not isinstance(sample.iloc[0], str):
+        return "mixed"
+    text = sample.iloc[0].strip()
+    for fmt in ISO_DATE_FORMATS:
+        try:
+            dt.datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        return fmt
+    return guess_datetime_format(text) or "mixed"
+
+
 def coerce_dates(df: pd.DataFrame, columns: Iterable[str]) -> None:
     for column in columns:
         if column not in df.columns:
             continue
-        if pd.api.types.is_datetime64_any_dtype(df[column]):
-            df[column] = df[column].dt.date
-            continue
-        for fmt in ISO_DATE_FORMATS:
-            try:
-                df[column] = pd.to_datetime(df[column], format=fmt, errors="raise").dt.date
-            except (ValueError, TypeError):
-                continue
-            else:
-                break
-        df[column] = pd.to_datetime(df[column], errors="coerce").dt.date
+        values = df[column]
+        if not pd.api.types.is_datetime64_any_dtype(values):
+            # The format is guessed from stripped text; parse the same text.
+            if pd.api.types.infer_dtype(values, skipna=True) == "string":
+                values = values.str.strip()
+            values = pd.to_datetime(values, errors="coerce", format=guess_date_format(values))
+        df[column] = values.dt.date
 
 
 def fill_missing_numeric(df: pd.DataFrame) -> None:
-    numeric_columns = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
-    if numeric_columns:
-        df[numeric_columns] = df[numeric_columns].fillna(0)
+    # Only touch numeric columns that actually contain gaps; filling them in
+    # place avoids copying the numeric block and assigning it back.
+    numeric_columns = df.select_dtypes(include="number").columns
+    with_gaps = [c for c in numeric_columns if df[c].hasnans]
+    if with_gaps:
+        df.fillna(dict.fromkeys(with_gaps, 0), inplace=True)
 
 
 def to_json_primitive(value: object) -> object:
-    if value is None:
+    if value is None or value is pd.NA:
         return None
+    if pa is not None and isinstance(value, pa.Scalar):
+        value = value.as_py()
+        if value is None:
+            return None
     if isinstance(value, float) and math.isnan(value):
         return None
     if isinstance(value, (np.floating, np.integer)):
@@ -130,35 +233,188 @@ def to_json_primitive(value: object) -> object:
     return text or None
 
 
+def is_timestamp(series: pd.Series) -> bool:
+    """Datetime columns with a time of day; Arrow ``date32`` columns only hold dates."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.ArrowDtype) and pa.types.is_date(dtype.pyarrow_dtype):
+        return False
+    return pd.api.types.is_datetime64_any_dtype(series)
+
+
+def timestamp_text(series: pd.Series) -> pd.Series:
+    """Render timestamps like ``datetime.isoformat`` on both the numpy and Arrow backends."""
+    # Arrow's %S carries its own fraction while numpy's does not, so format
+    # whole seconds and append microseconds only where there are any.
+    text = series.dt.strftime("%Y-%m-%dT%H:%M:%S").str.slice(0, 19)
+    micro = series.dt.microsecond.fillna(0).astype("int64")
+    if not micro.any():
+        return text
+    fraction = ("." + micro.astype(str).str.zfill(6)).where(micro > 0, "")
+    return text + fraction
+
+
+def datetime_values(series: pd.Series) -> List[object]:
+    text = timestamp_text(series)
+    return text.astype(object).where(series.notna(), None).tolist()
+
+
+def exact_values(series: pd.Series) -> List[object]:
+    # Integer and boolean columns without missing cells need no masking.
+    if not series.hasnans:
+        return series.tolist()
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def float_values(series: pd.Series) -> List[object]:
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def string_values(series: pd.Series) -> List[object]:
+    text = series.str.strip()
+    return text.astype(object).where(text.str.len() > 0, None).tolist()
+
+
+def date_values(series: pd.Series) -> List[object]:
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def mixed_values(series: pd.Series) -> List[object]:
+    return [to_json_primitive(value) for value in series.tolist()]
+
+
+def make_converter(series: pd.Series) -> Callable[[pd.Series], List[object]]:
+    """Pick the column-wide converter that turns ``series`` into JSON-ready values."""
+    if is_timestamp(series):
+        return datetime_values
+    if pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return exact_values
+    if pd.api.types.is_numeric_dtype(series):
+        return float_values
+    kind = pd.api.types.infer_dtype(series, skipna=True)
+    if kind == "string":
+        return string_values
+    if kind == "date":
+        return date_values
+    return mixed_values
+
+
+def column_converters(df: pd.DataFrame) -> Dict[str, Callable[[pd.Series], List[object]]]:
+    return {column: make_converter(df[column]) for column in df.columns}
+
+
+def json_values(series: pd.Series) -> List[object]:
+    """Convert ``series`` exactly like slice cells, with dates rendered as ISO text."""
+    values = make_converter(series)(series)
+    return [value.isoformat() if isinstance(value, dt.date) else value for value in values]
+
+
+def dump_json_bytes(payload: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, ensure_ascii=False, default=to_json_primitive).encode("utf-8")
+
+
+def arrow_table(df: pd.DataFrame) -> "pa.Table":
+    columns: Dict[str, pd.Series] = {}
+    for column in df.columns:
+        series = df[column]
+        if series.dtype == object or pd.api.types.is_string_dtype(series):
+            kind = pd.api.types.infer_dtype(series, skipna=True)
+            if kind == "string":
+                # Same cleanup as the JSON slices so the footer statistics
+                # line up with the stripped values in the filter index.
+                text = series.str.strip()
+                series = text.where(text.str.len() > 0)
+            elif kind not in ("date", "empty"):
+                # Arrow columns must be homogeneous; store mixed cells as text.
+                series = series.map(to_json_primitive).astype("string")
+        columns[column] = series
+    return pa.Table.from_pandas(pd.DataFrame(columns), preserve_index=False)
+
+
+def parquet_column_stats(path: Path) -> Dict[str, Dict[str, object]]:
+    """Collect per-column min/max values from the Parquet footer."""
+    metadata = pq.read_metadata(path)
+    stats: Dict[str, Dict[str, object]] = {}
+    for column_idx, field in enumerate(metadata.schema.to_arrow_schema()):
+        lower = upper = None
+        for group_idx in range(metadata.num_row_groups):
+            column_stats = metadata.row_group(group_idx).column(column_idx).statistics
+            if column_stats is None or not column_stats.has_min_max:
+                continue
+            lower = column_stats.min if lower is None else min(lower, column_stats.min)
+            upper = column_stats.max if upper is None else max(upper, column_stats.max)
+        if lower is None:
+            continue
+        stats[field.name] = {
+            "min": lower.isoformat() if isinstance(lower, (dt.date, dt.datetime)) else lower,
+            "max": upper.isoformat() if isinstance(upper, (dt.date, dt.datetime)) else upper,
+        }
+    return stats
+
+
 def slugify(text: str) -> str:
+    if text.isascii():
+        return text.translate(SLUG_TABLE).strip("-")
     return "".join(ch.lower() if ch.isalnum() else "-" for ch in text).strip("-")
 
 
 def hash_key(parts: Sequence[str]) -> str:
     data = "|".join(part or "" for part in parts)
-    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:12]
+    # Only used for short directory names; blake2b is faster than sha1 and a
+    # 6-byte digest keeps the 12 hex character keys.
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=6).hexdigest()
 
 
-def expand_partition_value(column: str, value: object, rule: str | None) -> object:
+def parse_partition_spec(partition_spec: Sequence[str]) -> List[tuple[str, str | None]]:
+    processed_spec: List[tuple[str, str | None]] = []
+    for entry in partition_spec:
+        if ":" in entry:
+            column, rule = entry.split(":", 1)
+        else:
+            column, rule = entry, None
+        if rule is not None and rule not in PERIOD_UNITS:
+            raise ValueError(f"Unknown partition rule '{rule}' for column '{column}'")
+        processed_spec.append((column, rule))
+    return processed_spec
+
+
+def factorize_columns(
+    df: pd.DataFrame, columns: Iterable[str]
+) -> Dict[str, tuple[np.ndarray, pd.Index]]:
+    """Factorize each column once (missing values get their own code) for reuse."""
+    return {
+        column: pd.factorize(df[column], sort=False, use_na_sentinel=False)
+        for column in dict.fromkeys(columns)
+        if column in df.columns
+    }
+
+
+def factorize_partition_column(
+    df: pd.DataFrame,
+    column: str,
+    rule: str | None,
+    factorized: Mapping[str, tuple[np.ndarray, pd.Index]],
+) -> tuple[np.ndarray, Sequence[object]]:
+    """Return per-row bucket codes for a partition column and the bucket value of each code."""
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=np.intp), [None]
+    values = df[column]
     if rule is None:
-        return value
-    if rule == "month":
-        if isinstance(value, (dt.date, dt.datetime)):
-            return dt.date(value.year, value.month, 1)
-        value = pd.to_datetime(value, errors="coerce")
-        if pd.isna(value):
-            return None
-        value = value.to_pydatetime()
-        return dt.date(value.year, value.month, 1)
-    if rule == "year":
-        if isinstance(value, (dt.date, dt.datetime)):
-            return dt.date(value.year, 1, 1)
-        value = pd.to_datetime(value, errors="coerce")
-        if pd.isna(value):
-            return None
-        value = value.to_pydatetime()
-        return dt.date(value.year, 1, 1)
-    raise ValueError(f"Unknown partition rule '{rule}' for column '{column}'")
+        if column in factorized:
+            return factorized[column]
+        return pd.factorize(values, sort=False, use_na_sentinel=False)
+    unit = PERIOD_UNITS[rule]
+    # Truncating to the period unit turns every row into an integer period
+    # number (NaT stays NaT), so only the distinct periods become dates.
+    parsed = pd.to_datetime(values, errors="coerce").to_numpy()
+    periods = parsed.astype(f"datetime64[{unit}]")
+    codes, uniques = pd.factorize(periods.view(np.int64), sort=False)
+    buckets = [
+        None if np.isnat(period) else period.astype("datetime64[D]").item()
+        for period in uniques.view(f"datetime64[{unit}]")
+    ]
+    return codes, buckets
 
 
 @dataclass
@@ -167,90 +423,225 @@ class PartitionDescriptor:
     filters: Mapping[str, object]
     row_count: int
     path: Path
+    stats: Mapping[str, Mapping[str, object]] | None = None
 
 
-def iter_partitions(
-    df: pd.DataFrame, partition_spec: Sequence[str], base_path: Path, fmt: str
-) -> Iterator[PartitionDescriptor]:
+def iter_partition_slices(
+    df: pd.DataFrame,
+    partition_spec: Sequence[str],
+    base_path: Path,
+    factorized: Mapping[str, tuple[np.ndarray, pd.Index]],
+) -> Iterator[tuple[pd.DataFrame, Path, Dict[str, object]]]:
     if not partition_spec:
-        yield write_partition_slice(df, base_path / "all", fmt, {})
+        yield df, base_path / "all", {}
         return
 
-    processed_spec: List[tuple[str, str | None]] = []
-    for entry in partition_spec:
-        if ":" in entry:
-            column, rule = entry.split(":", 1)
-        else:
-            column, rule = entry, None
-        processed_spec.append((column, rule))
+    processed_spec = parse_partition_spec(partition_spec)
+    if df.empty:
+        return
 
-    def derive_bucket(row: Mapping[str, object]) -> tuple:
-        bucket: List[object] = []
-        for column, rule in processed_spec:
-            value = row.get(column)
-            bucket.append(expand_partition_value(column, value, rule))
-        return tuple(bucket)
-
-    bucketed: MutableMapping[tuple, List[int]] = {}
-    for idx, row in df.iterrows():
-        key = derive_bucket(row)
-        bucketed.setdefault(key, []).append(idx)
-
-    for bucket_values, indices in bucketed.items():
-        key = hash_key([str(to_json_primitive(v) or "") for v in bucket_values])
-        filters = {
-            column: to_json_primitive(value) for (column, _), value in zip(processed_spec, bucket_values)
-        }
-        slice_df = df.loc[indices]
+    # Factorize every key column and fold the codes into a single dense int64
+    # code per row; re-factorizing after each fold keeps it from overflowing.
+    keys = [
+        factorize_partition_column(df, column, rule, factorized) for column, rule in processed_spec
+    ]
+    combined = np.zeros(len(df), dtype=np.int64)
+    for codes, uniques in keys:
+        combined, _ = pd.factorize(combined * len(uniques) + codes, sort=False)
+
+    # A stable sort groups equal codes while keeping each group's rows in their
+    # original order; the first row of a group is therefore its first occurrence.
+    order = np.argsort(combined, kind="stable")
+    boundaries = np.flatnonzero(np.diff(combined[order])) + 1
+    groups = np.split(order, boundaries)
+    groups.sort(key=lambda indices: indices[0])
+
+    # Convert each column's distinct values once so partition filters carry the
+    # same JSON types as the cells in the slices.
+    typed_keys = [(codes, json_values(pd.Series(uniques))) for codes, uniques in keys]
+    for indices in groups:
+        first = indices[0]
+        bucket_values = tuple(values[codes[first]] for codes, values in typed_keys)
+        key = hash_key(["" if v is None else str(v) for v in bucket_values])
+        filters = {column: value for (column, _), value in zip(processed_spec, bucket_values)}
+        slice_df = df.take(indices)
         directory = base_path / key
-        yield write_partition_slice(slice_df, directory, fmt, filters)
+        yield slice_df, directory, filters
+
+
+def iter_partitions(
+    df: pd.DataFrame,
+    partition_spec: Sequence[str],
+    base_path: Path,
+    fmt: str,
+    workers: int | None = None,
+    factorized: Mapping[str, tuple[np.ndarray, pd.Index]] | None = None,
+) -> Iterator[PartitionDescriptor]:
+    slices = iter_partition_slices(df, partition_spec, base_path, factorized or {})
+    # Dtype dispatch happens once for the whole frame rather than once per
+    # column of every slice.
+    converters = column_converters(df) if fmt == "json" else None
+    # A single slice (e.g. no --partition) gains nothing from a worker process
+    # and would only pickle the whole frame across.
+    head = list(islice(slices, 2))
+    slices = chain(head, slices)
+    if workers == 1 or len(head) < 2:
+        for slice_df, directory, filters in slices:
+            yield write_partition_slice(slice_df, directory, fmt, filters, converters)
+        return
+
+    # Every slice is disjoint and lands in its own directory, so the writes can
+    # run in separate processes.  Only a small window of slices is in flight at
+    # once so their copies do not pile up in the parent, and results are
+    # yielded in submission order to keep index.json stable between runs.
+    window = 2 * (workers or os.cpu_count() or 1)
+    pending: deque[Future[PartitionDescriptor]] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for slice_df, directory, filters in slices:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(
+                executor.submit(write_partition_slice, slice_df, directory, fmt, filters, converters)
+            )
+        while pending:
+            yield pending.popleft().result()
 
 
 def write_partition_slice(
-    df: pd.DataFrame, directory: Path, fmt: str, filters: Mapping[str, object]
+    df: pd.DataFrame,
+    directory: Path,
+    fmt: str,
+    filters: Mapping[str, object],
+    converters: Mapping[str, Callable[[pd.Series], List[object]]] | None = None,
 ) -> PartitionDescriptor:
     ensure_output_directory(directory)
     key = directory.name
+    stats = None
     if fmt == "json":
-        payload = {
-            "columns": list(df.columns),
-            "data": [
-                [to_json_primitive(value) for value in row]
-                for row in df.itertuples(index=False, name=None)
-            ],
-        }
-        output_path = directory / "data.json"
-        with output_path.open("w", encoding="utf-8") as fp:
-            json.dump(payload, fp, ensure_ascii=False)
+        columns = list(df.columns)
+        if converters is None:
+            converters = column_converters(df)
+        output_path = directory / "data.json.gz"
+        # Level 1 deflate is nearly free and JSON compresses extremely well.
+        # The payload is streamed one column at a time so that only a single
+        # converted column is held in memory instead of the whole document.
+        with gzip.open(output_path, "wb", compresslevel=1) as fp:
+            fp.write(b'{"columns":' + dump_json_bytes(columns) + b',"data":{')
+            for position, column in enumerate(columns):
+                if position:
+                    fp.write(b",")
+                fp.write(dump_json_bytes(column) + b":")
+                fp.write(dump_json_bytes(converters[column](df[column])))
+            fp.write(b"}}")
+    elif fmt == "parquet":
+        output_path = directory / "data.parquet"
+        pq.write_table(
+            arrow_table(df),
+            output_path,
+            compression="zstd",
+            use_dictionary=True,
+            data_page_size=64 * 1024,
+        )
+        stats = parquet_column_stats(output_path)
     else:
         output_path = directory / "data.csv.gz"
         df.to_csv(output_path, index=False, compression="gzip")
-    return PartitionDescriptor(key=key, filters=filters, row_count=len(df), path=output_path)
+    return PartitionDescriptor(
+        key=key, filters=filters, row_count=len(df), path=output_path, stats=stats
+    )
 
 
-def build_filter_index(df: pd.DataFrame, filter_columns: Sequence[str]) -> Dict[str, List[str]]:
-    index: Dict[str, List[str]] = {}
+def build_filter_index(
+    df: pd.DataFrame,
+    filter_columns: Sequence[str],
+    factorized: Mapping[str, tuple[np.ndarray, pd.Index]] | None = None,
+) -> Dict[str, List[object]]:
+    index: Dict[str, List[object]] = {}
     for column in filter_columns:
         if column not in df.columns:
             continue
-        values: List[str] = []
-        for raw in df[column].dropna():
-            converted = to_json_primitive(raw)
-            if converted is None:
-                continue
-            text = str(converted).strip()
-            if not text:
-                continue
-            values.append(text)
-        index[column] = sorted(dict.fromkeys(values))
+        # Work on the distinct values only so each is converted once.  The
+        # values are typed like the slice cells so the loader can compare them
+        # directly; numbers sort ahead of text in mixed columns.
+        if factorized and column in factorized:
+            values = pd.Series(factorized[column][1]).dropna()
+        else:
+            values = df[column].dropna().drop_duplicates()
+        typed = {value for value in json_values(values) if value is not None}
+        index[column] = sorted(typed, key=lambda value: (isinstance(value, str), value))
     return index
 
 
+def partition_entry(partition: PartitionDescriptor, base_path: Path) -> Dict[str, object]:
+    entry: Dict[str, object] = {
+        "key": partition.key,
+        "filters": partition.filters,
+        "rowCount": partition.row_count,
+        "path": partition.path.relative_to(base_path).as_posix(),
+    }
+    if partition.stats is not None:
+        entry["stats"] = partition.stats
+    return entry
+
+
+def write_metadata(
+    path: Path,
+    metadata: Mapping[str, object],
+    partitions: Iterable[PartitionDescriptor],
+    base_path: Path,
+    indent: int | None,
+) -> int:
+    """Write ``index.json``, streaming the partition list so it is never held in memory."""
+    # Render the fixed fields with an empty trailing "partitions" list, then
+    # splice the entries in between its brackets as they are produced.
+    document = json.dumps({**metadata, "partitions": []}, ensure_ascii=False, indent=indent)
+    prefix, _, suffix = document.rpartition("[]")
+    separator = b"," if indent is None else b",\n" + b" " * (2 * indent)
+    count = 0
+
+    def render(partition: PartitionDescriptor) -> bytes:
+        entry = partition_entry(partition, base_path)
+        if indent is None:
+            return dump_json_bytes(entry)
+        # Entries sit two levels deep (document -> "partitions" -> entry).
+        text = json.dumps(entry, ensure_ascii=False, indent=indent, default=to_json_primitive)
+        return text.replace("\n", "\n" + " " * (2 * indent)).encode("utf-8")
+
+    # Stream into a sibling file and move it into place only once every slice
+    # has been written, so a failed run leaves the previous index untouched.
+    staging_path = path.with_name(path.name + ".tmp")
+    try:
+        with staging_path.open("wb") as fp:
+            fp.write(prefix.encode("utf-8") + b"[")
+            if indent is not None:
+                fp.write(separator[1:])
+            for partition in partitions:
+                if count:
+                    fp.write(separator)
+                fp.write(render(partition))
+                count += 1
+            if indent is not None:
+                fp.write(b"\n" + b" " * indent)
+            fp.write(b"]" + suffix.encode("utf-8") + b"\n")
+    except BaseException:
+        staging_path.unlink(missing_ok=True)
+        raise
+    os.replace(staging_path, path)
+    return count
+
+
 def main() -> None:
     args = parse_args()
     workbook = args.workbook.resolve()
     if not workbook.exists():
         raise SystemExit(f"Workbook not found: {workbook}")
+    if args.format == "parquet" and pq is None:
+        raise SystemExit("pyarrow is required for parquet output. Install it via 'pip install pyarrow'.")
+    # Reject a bad --partition spec before reading the workbook.
+    try:
+        partition_spec = parse_partition_spec(args.partition)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from None
 
     ensure_output_directory(args.out)
 
@@ -258,11 +649,12 @@ def main() -> None:
     coerce_dates(df, [col for col in df.columns if "date" in col.lower()])
     fill_missing_numeric(df)
 
-    filter_index = build_filter_index(df, args.filters)
+    # Filter columns and plain partition columns are hashed once and the codes
+    # shared by the filter index and the partitioner.
+    plain_partition_columns = [column for column, rule in partition_spec if rule is None]
+    factorized = factorize_columns(df, [*args.filters, *plain_partition_columns])
 
-    partitions: List[PartitionDescriptor] = list(
-        iter_partitions(df, args.partition, args.out, args.format)
-    )
+    filter_index = build_filter_index(df, args.filters, factorized)
 
     metadata = {
         "version": 1,
@@ -271,24 +663,16 @@ def main() -> None:
         "rowCount": int(df.shape[0]),
         "columns": list(df.columns),
         "filters": filter_index,
-        "partitions": [
-            {
-                "key": partition.key,
-                "filters": partition.filters,
-                "rowCount": partition.row_count,
-                "path": partition.path.relative_to(args.out).as_posix(),
-            }
-            for partition in partitions
-        ],
         "format": args.format,
     }
+    if args.format == "json":
+        metadata["encoding"] = "gzip"
 
+    partitions = iter_partitions(df, args.partition, args.out, args.format, args.workers, factorized)
     metadata_path = args.out / "index.json"
-    with metadata_path.open("w", encoding="utf-8") as fp:
-        json.dump(metadata, fp, ensure_ascii=False, indent=args.indent)
-        fp.write("\n")
+    partition_count = write_metadata(metadata_path, metadata, partitions, args.out, args.indent)
 
-    print(f"Wrote {metadata_path} and {len(partitions)} partition(s)")
+    print(f"Wrote {metadata_path} and {partition_count} partition(s)")
 
 
 if __name__ == "__main__":